@@ -0,0 +1,48 @@
+"""
+Numerically heavy dashboard statistics.
+
+calculate_metrics pushes the simple aggregates (count / PnL sum / win
+count) into SQL, but the path-dependent statistics below need the
+ordered sequence of trade results: drawdown depends on the running
+equity curve, not on any per-row aggregate. The kernel is a tight loop
+over a NumPy array, JIT-compiled with numba when it is installed; the
+decorator degrades to a no-op so the same function runs as plain Python
+otherwise.
+"""
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - numba is optional
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+
+        def wrap(func):
+            return func
+        return wrap
+
+
+@njit(cache=True)
+def compute_trade_stats(profits):
+    """Walk a close-time-ordered profit series in one pass.
+
+    Returns (max_drawdown, gross_profit, gross_loss).
+    """
+    equity = 0.0
+    peak = 0.0
+    max_drawdown = 0.0
+    gross_profit = 0.0
+    gross_loss = 0.0
+    for i in range(profits.shape[0]):
+        p = profits[i]
+        equity += p
+        if equity > peak:
+            peak = equity
+        drawdown = peak - equity
+        if drawdown > max_drawdown:
+            max_drawdown = drawdown
+        if p > 0.0:
+            gross_profit += p
+        else:
+            gross_loss -= p
+    return max_drawdown, gross_profit, gross_loss
@@ -0,0 +1,833 @@
+"""
+AI Scalping System - Backend API
+================================
+
+Flask backend for the AI scalping system. Receives tick data and trade
+reports from the MT4 Expert Advisor, stores them in the database, serves
+trading signals back to the EA and streams live dashboard data to the
+React frontend over Server-Sent Events.
+
+Endpoints:
+- GET  /api/health            - Health check (used by EA on init)
+- POST /api/ticks             - Receive buffered tick data from MT4
+- GET  /api/signals           - Latest trading signal for MT4 polling
+- POST /api/signals           - Publish a new signal from the AI engine
+- POST /api/trades            - Log opened / closed trades from MT4
+- GET  /api/dashboard/data    - One-shot dashboard snapshot
+- GET  /api/dashboard/stream  - Real-time dashboard data (SSE)
+
+Environment:
+- DATABASE_URL  - SQLAlchemy URL (defaults to local SQLite file)
+- PORT          - Listen port (Render sets this automatically)
+"""
+
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from collections import deque
+from logging.handlers import QueueHandler, QueueListener
+from datetime import datetime
+
+import numpy as np
+from flask import Flask, Response, jsonify, request, stream_with_context
+from flask.json.provider import DefaultJSONProvider
+from flask_cors import CORS
+from sqlalchemy import (Column, Float, Index, Integer, String, create_engine,
+                        event, text)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import declarative_base, scoped_session, sessionmaker
+
+from _metrics_jit import compute_trade_stats
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional, stdlib json still works
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - optional, get_json path still works
+    msgspec = None
+
+if msgspec is not None:
+    class _TickMsg(msgspec.Struct):
+        timestamp: float = 0.0
+        bid: float = 0.0
+        ask: float = 0.0
+        spread: float = 0.0
+        volume: int = 0
+
+    class _TickBatchMsg(msgspec.Struct):
+        symbol: str = 'EURUSD'
+        ticks: list[_TickMsg] = []
+
+    _tick_decoder = msgspec.json.Decoder(_TickBatchMsg)
+else:
+    _tick_decoder = None
+
+#--- Configuration
+DATABASE_URL = os.environ.get('DATABASE_URL', 'sqlite:///trading.db')
+# Render hands out postgres:// URLs which SQLAlchemy 1.4+ no longer accepts
+if DATABASE_URL.startswith('postgres://'):
+    DATABASE_URL = DATABASE_URL.replace('postgres://', 'postgresql://', 1)
+
+# File and stream writes happen on a listener thread; request handlers
+# only enqueue records, so logging never adds a write() syscall (or the
+# FileHandler lock) to the ingest path.
+_log_queue = queue.SimpleQueue()
+_log_formatter = logging.Formatter(
+    '%(asctime)s %(levelname)s %(name)s: %(message)s')
+_log_targets = [logging.FileHandler('backend.log'), logging.StreamHandler()]
+for _handler in _log_targets:
+    _handler.setFormatter(_log_formatter)
+# The queue handler must not pre-format, or the listener's handlers
+# would format the record a second time.
+_queue_handler = QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))
+logging.basicConfig(level=logging.INFO, handlers=[_queue_handler])
+_log_listener = QueueListener(_log_queue, *_log_targets)
+_log_listener.start()
+logger = logging.getLogger('backend')
+
+app = Flask(__name__)
+CORS(app)
+
+if orjson is not None:
+    class FastJSONProvider(DefaultJSONProvider):
+        """orjson codec for the app: request.get_json parses every EA
+        tick batch, so the C parser matters as much as the dumps side."""
+
+        @staticmethod
+        def loads(s, **kwargs):
+            return orjson.loads(s)
+
+        @staticmethod
+        def dumps(obj, **kwargs):
+            return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+
+    app.json = FastJSONProvider(app)
+
+#--- Database setup
+connect_args = {}
+if DATABASE_URL.startswith('sqlite'):
+    # Flask serves requests from multiple threads
+    connect_args['check_same_thread'] = False
+
+engine = create_engine(
+    DATABASE_URL,
+    pool_size=8,
+    max_overflow=16,
+    pool_pre_ping=True,
+    connect_args=connect_args,
+)
+
+if engine.dialect.name == 'sqlite':
+    @event.listens_for(engine, 'connect')
+    def _set_sqlite_pragmas(dbapi_conn, _connection_record):
+        # WAL lets the dashboard readers run concurrently with the tick
+        # writer; synchronous=NORMAL drops the per-commit fsync to one.
+        cur = dbapi_conn.cursor()
+        cur.execute('PRAGMA journal_mode=WAL')
+        cur.execute('PRAGMA synchronous=NORMAL')
+        cur.execute('PRAGMA temp_store=MEMORY')
+        cur.execute('PRAGMA mmap_size=268435456')
+        cur.execute('PRAGMA cache_size=-65536')
+        cur.execute('PRAGMA busy_timeout=5000')
+        cur.close()
+
+SessionLocal = scoped_session(sessionmaker(bind=engine))
+Base = declarative_base()
+
+
+class Tick(Base):
+    """Raw tick as received from the MT4 EA."""
+    __tablename__ = 'ticks_raw'
+
+    id = Column(Integer, primary_key=True)
+    timestamp = Column(Float)
+    symbol = Column(String(12))
+    bid = Column(Float)
+    ask = Column(Float)
+    spread = Column(Float)
+    volume = Column(Integer)
+
+
+class Trade(Base):
+    """A trade opened (and later closed) by the EA."""
+    __tablename__ = 'trades'
+    __table_args__ = (
+        # Open positions are the needle-in-a-haystack query: the partial
+        # index stays tiny no matter how many closed trades accumulate.
+        Index('ix_trades_open_positions', 'open_time',
+              sqlite_where=text('close_time IS NULL'),
+              postgresql_where=text('close_time IS NULL')),
+    )
+
+    id = Column(Integer, primary_key=True)
+    ticket = Column(Integer, unique=True, index=True)
+    symbol = Column(String(12))
+    direction = Column(String(4))
+    lots = Column(Float)
+    open_price = Column(Float)
+    open_time = Column(Float, index=True)
+    close_price = Column(Float)
+    close_time = Column(Float, index=True)
+    sl = Column(Float)
+    tp = Column(Float)
+    profit = Column(Float)
+    comment = Column(String(64))
+
+
+class Signal(Base):
+    """A trading signal produced by the AI engine."""
+    __tablename__ = 'signals'
+
+    id = Column(Integer, primary_key=True)
+    timestamp = Column(Float, index=True)
+    symbol = Column(String(12))
+    direction = Column(String(4))
+    entry_price = Column(Float)
+    sl = Column(Float)
+    tp = Column(Float)
+    confidence = Column(Float)
+
+
+# The EA reports a trade twice under one ticket (open, then close), so
+# trade logging is an UPSERT keyed on the ticket's unique index.
+_trade_insert = sqlite_insert if engine.dialect.name == 'sqlite' else pg_insert
+
+# Tick inserts bypass the ORM: one executemany per batch instead of one
+# unit-of-work INSERT per tick (the EA sends up to 500 ticks per POST).
+_TICK_INSERT_SQL = (
+    'INSERT INTO ticks_raw (timestamp, symbol, bid, ask, spread, volume) '
+    'VALUES (?, ?, ?, ?, ?, ?)'
+    if engine.dialect.paramstyle == 'qmark'
+    else 'INSERT INTO ticks_raw (timestamp, symbol, bid, ask, spread, volume) '
+         'VALUES (%s, %s, %s, %s, %s, %s)'
+)
+
+
+#--- Prepared statements
+#
+# One text() object per hot query, built once: SQLAlchemy keys its
+# compiled-statement cache on the construct, and sqlite3 keys its
+# per-connection prepared-statement cache on the literal SQL string, so
+# reusing these singletons skips both re-compiles on every call.
+_METRICS_STMT = text(
+    'SELECT COUNT(*) AS n, COALESCE(SUM(profit), 0) AS pnl, '
+    'COALESCE(SUM(CASE WHEN profit > 0 THEN 1 ELSE 0 END), 0) AS wins '
+    'FROM trades WHERE close_time IS NOT NULL AND close_time >= :t '
+    'UNION ALL '
+    'SELECT COUNT(*), 0, 0 FROM signals WHERE timestamp >= :t')
+
+_PROFITS_STMT = text(
+    'SELECT profit FROM trades '
+    'WHERE close_time IS NOT NULL AND close_time >= :t '
+    'ORDER BY close_time')
+
+_OPEN_TRADES_STMT = text(
+    'SELECT ticket, symbol, direction, lots, open_price, open_time '
+    'FROM trades WHERE close_time IS NULL ORDER BY open_time DESC')
+
+_RECENT_TRADES_STMT = text(
+    'SELECT ticket, symbol, direction, open_price, close_price, profit, '
+    'close_time FROM trades WHERE close_time IS NOT NULL '
+    'ORDER BY close_time DESC LIMIT :limit')
+
+_RECENT_SIGNALS_STMT = text(
+    'SELECT symbol, direction, confidence, timestamp FROM signals '
+    'ORDER BY timestamp DESC LIMIT :limit')
+
+
+def get_db_session():
+    """Return the thread-scoped ORM session (one per worker thread)."""
+    return SessionLocal()
+
+
+def get_db_connection():
+    """Legacy raw DBAPI connection, used for quick connectivity checks."""
+    return engine.raw_connection()
+
+
+def init_database():
+    """Create tables if they do not exist yet."""
+    Base.metadata.create_all(engine)
+    # Deployments that predate these indexes keep their existing tables,
+    # and create_all never touches a table that already exists - its
+    # indexes included - so backfill every hot index explicitly.
+    with engine.begin() as conn:
+        conn.execute(text(
+            'CREATE INDEX IF NOT EXISTS ix_trades_close_time '
+            'ON trades (close_time)'))
+        conn.execute(text(
+            'CREATE INDEX IF NOT EXISTS ix_trades_open_time '
+            'ON trades (open_time)'))
+        conn.execute(text(
+            'CREATE INDEX IF NOT EXISTS ix_trades_open_positions '
+            'ON trades (open_time) WHERE close_time IS NULL'))
+        conn.execute(text(
+            'CREATE INDEX IF NOT EXISTS ix_signals_timestamp '
+            'ON signals (timestamp)'))
+        conn.execute(text(
+            'CREATE UNIQUE INDEX IF NOT EXISTS ix_trades_ticket '
+            'ON trades (ticket)'))
+    logger.info('Database initialized')
+
+
+class TickRing:
+    """Structure-of-arrays ring buffer over the most recent ticks.
+
+    Columns live in preallocated NumPy arrays instead of a list of
+    per-tick dicts (~48B of packed floats per tick instead of ~240B of
+    boxed objects), and any downstream feature math runs vectorized
+    over whole columns rather than re-reading dict fields per tick.
+    """
+
+    def __init__(self, capacity=4096):
+        self.capacity = capacity
+        self.timestamp = np.empty(capacity, dtype='f8')
+        self.bid = np.empty(capacity, dtype='f8')
+        self.ask = np.empty(capacity, dtype='f8')
+        self.spread = np.empty(capacity, dtype='f8')
+        self.volume = np.empty(capacity, dtype='i8')
+        self.head = 0
+        self.count = 0
+
+    def extend(self, rows):
+        """Append (timestamp, symbol, bid, ask, spread, volume) rows,
+        the same tuples the ingest path feeds to executemany."""
+        for ts, _symbol, bid, ask, spread, volume in rows:
+            i = self.head
+            self.timestamp[i] = ts
+            self.bid[i] = bid
+            self.ask[i] = ask
+            self.spread[i] = spread
+            self.volume[i] = volume
+            self.head = (i + 1) % self.capacity
+        self.count = min(self.count + len(rows), self.capacity)
+
+    def _column(self, arr):
+        if self.count < self.capacity:
+            return arr[:self.count]
+        return np.concatenate((arr[self.head:], arr[:self.head]))
+
+    def features(self):
+        """Current feature columns in arrival order, as plain arrays."""
+        bid = self._column(self.bid)
+        ask = self._column(self.ask)
+        return {
+            'timestamp': self._column(self.timestamp),
+            'mid': (bid + ask) / 2,
+            'spread': ask - bid,
+            'volume': self._column(self.volume),
+        }
+
+
+#--- In-memory cache shared between the ingest and dashboard paths
+cache = {
+    # Bounded ring buffer: appends evict the oldest tick in place, with
+    # no slice-copy and no GC churn inside the ingest path.
+    'latest_ticks': deque(maxlen=100),
+}
+
+# Numeric tick history for the signal generator, written only by the
+# tick ingest path.
+tick_ring = TickRing()
+
+# Single-writer / many-reader fields are plain module globals: a Python
+# reference assignment is atomic under the GIL, so readers on the hot
+# polling paths take no lock and never contend with the writers.
+_system_status = 'OPERATIONAL'
+
+# The EA polls GET /api/signals every 500ms but the answer only changes
+# when a signal is posted, so the serialized body and its ETag are built
+# once at write time. Body and tag live in one tuple so readers always
+# see a matching pair.
+_signal_version = 0
+_signal_response = (b'{"status":"no_signal"}', '"0"')
+
+
+def _json_dumps(obj):
+    """Serialize to UTF-8 bytes, via orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+@app.teardown_appcontext
+def _remove_session(_exc=None):
+    """Release the request thread's session back to the pool."""
+    SessionLocal.remove()
+
+
+#--- Dashboard helpers
+_midnight_cache = {'day': -1, 'ts': 0.0}
+
+
+def _today_start_ts():
+    """Epoch timestamp of local midnight, recomputed once per day.
+
+    calculate_metrics runs on every dashboard refresh; building a
+    datetime and resolving tzdata each time is wasted work for a value
+    that changes once every 24h.
+    """
+    day = int(time.time() // 86400)
+    if _midnight_cache['day'] != day:
+        _midnight_cache['ts'] = datetime.now().replace(
+            hour=0, minute=0, second=0, microsecond=0).timestamp()
+        _midnight_cache['day'] = day
+    return _midnight_cache['ts']
+
+
+def calculate_metrics():
+    """Aggregate today's closed trades and signal count for the dashboard."""
+    today_timestamp = _today_start_ts()
+
+    session = get_db_session()
+    # Aggregate in SQL: three scalars come back instead of every trade
+    # row, and the signals count rides along in the same round trip.
+    trade_row, signal_row = session.execute(
+        _METRICS_STMT, {'t': today_timestamp}).all()
+
+    total_trades = trade_row.n
+    wins = trade_row.wins
+    today_pnl = trade_row.pnl
+    win_rate = (wins / total_trades * 100) if total_trades > 0 else 0
+    signals_today = signal_row.n
+
+    # Drawdown is path-dependent, so it cannot come out of the aggregate
+    # query above; fetch the bare profit column and hand it to the
+    # (numba-jitted) one-pass kernel.
+    max_drawdown = 0.0
+    profit_factor = 0.0
+    if total_trades > 0:
+        profits = np.fromiter(
+            (row.profit or 0 for row in session.execute(
+                _PROFITS_STMT, {'t': today_timestamp})),
+            dtype=np.float64,
+        )
+        max_drawdown, gross_profit, gross_loss = (
+            float(v) for v in compute_trade_stats(profits))
+        profit_factor = gross_profit / gross_loss if gross_loss > 0 else gross_profit
+
+    return {
+        'todayPnl': round(today_pnl, 2),
+        'winRate': round(win_rate, 1),
+        'wins': wins,
+        'totalTrades': total_trades,
+        'signalsToday': signals_today,
+        'maxDrawdown': round(max_drawdown, 2),
+        'profitFactor': round(profit_factor, 2),
+    }
+
+
+def get_live_positions():
+    """Open trades with an indicative PnL from the most recent tick."""
+    # deque appends are atomic; peeking at the newest tick needs no
+    # lock. Rows are (timestamp, symbol, bid, ask, spread, volume).
+    latest_ticks = cache['latest_ticks']
+    last_tick = latest_ticks[-1] if latest_ticks else None
+
+    session = get_db_session()
+    open_trades = session.execute(_OPEN_TRADES_STMT).all()
+
+    positions = []
+    for t in open_trades:
+        if last_tick is not None:
+            current = last_tick[2] if t.direction == 'BUY' else last_tick[3]
+        else:
+            current = t.open_price or 0
+        point_value = (t.lots or 0) * 100000
+        if t.direction == 'BUY':
+            pnl = (current - (t.open_price or 0)) * point_value
+        else:
+            pnl = ((t.open_price or 0) - current) * point_value
+        positions.append({
+            'id': str(t.ticket),
+            'pair': t.symbol,
+            'action': t.direction,
+            'entryPrice': t.open_price,
+            'currentPrice': current,
+            'pnl': round(pnl, 2),
+            'lotSize': t.lots,
+            'entryTime': t.open_time,
+        })
+    return positions
+
+
+def get_recent_trades(limit=10):
+    """Most recently closed trades for the dashboard table."""
+    session = get_db_session()
+    trades = session.execute(_RECENT_TRADES_STMT, {'limit': limit}).all()
+
+    return [{
+        'id': str(t.ticket),
+        'pair': t.symbol,
+        'action': t.direction,
+        'entryPrice': t.open_price,
+        'exitPrice': t.close_price,
+        'pnl': t.profit,
+        'exitTime': t.close_time,
+    } for t in trades]
+
+
+def get_recent_signals(limit=10):
+    """Most recent AI signals for the dashboard panel."""
+    session = get_db_session()
+    signals = session.execute(_RECENT_SIGNALS_STMT, {'limit': limit}).all()
+
+    return [{
+        'pair': s.symbol,
+        'action': s.direction,
+        'confidence': s.confidence,
+        'timestamp': s.timestamp,
+    } for s in signals]
+
+
+#--- Single-writer queue
+#
+# SQLite permits one writer at a time, so concurrent commits from
+# worker threads just serialize on the file lock. Instead, every insert
+# is enqueued and a single daemon thread drains the queue, applying
+# whatever arrived within a short linger window as one transaction per
+# kind. Writers never contend with each other and the per-commit fsync
+# is amortized across the batch; ingest endpoints return as soon as the
+# item is queued.
+_write_queue = queue.SimpleQueue()
+
+_WRITE_BATCH_MAX = 256
+_WRITE_LINGER_S = 0.005
+
+
+def _apply_writes(items):
+    ticks = []
+    trades = []
+    signals = []
+    for kind, payload in items:
+        if kind == 'ticks':
+            ticks.extend(payload)
+        elif kind == 'trade':
+            trades.append(payload)
+        else:
+            signals.append(payload)
+
+    if ticks:
+        conn = engine.raw_connection()
+        try:
+            cur = conn.cursor()
+            if engine.dialect.name == 'sqlite':
+                cur.execute('BEGIN IMMEDIATE')
+            cur.executemany(_TICK_INSERT_SQL, ticks)
+            conn.commit()
+            cur.close()
+        finally:
+            conn.close()
+
+    if trades or signals:
+        session = get_db_session()
+        try:
+            for values in trades:
+                stmt = _trade_insert(Trade).values(**values)
+                update_cols = {
+                    k: v for k, v in values.items() if k != 'ticket'}
+                if update_cols:
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=['ticket'], set_=update_cols)
+                else:
+                    stmt = stmt.on_conflict_do_nothing(
+                        index_elements=['ticket'])
+                session.execute(stmt)
+            if signals:
+                session.execute(Signal.__table__.insert(), signals)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            SessionLocal.remove()
+
+
+def _db_writer():
+    while True:
+        items = [_write_queue.get()]
+        deadline = time.monotonic() + _WRITE_LINGER_S
+        while len(items) < _WRITE_BATCH_MAX:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                items.append(_write_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        try:
+            _apply_writes(items)
+        except Exception as exc:
+            logger.error('Write batch of %d items failed: %s',
+                         len(items), exc)
+        else:
+            # New data is committed; wake the dashboard refresher now
+            # instead of waiting for its next poll.
+            _dashboard_dirty.set()
+
+
+#--- Dashboard snapshot refresher
+#
+# One producer computes the dashboard state, serializes each section
+# once for all clients, and bumps a version per section only when its
+# payload actually changed; clients are woken only on real changes and
+# resend only the changed sections. The frontend already applies each
+# named SSE event wholesale, so suppressing unchanged sections needs no
+# client-side changes (unlike a JSON-patch scheme).
+_SECTION_NAMES = ('metrics', 'positions', 'trades', 'signals')
+_dashboard_sections = {}
+_dashboard_version = 0
+_dashboard_cond = threading.Condition()
+_dashboard_dirty = threading.Event()
+
+
+def _refresh_dashboard():
+    """Recompute the dashboard state and wake clients if it changed."""
+    global _dashboard_version
+    snapshot = {
+        'metrics': calculate_metrics(),
+        'positions': get_live_positions(),
+        'trades': get_recent_trades(),
+        'signals': get_recent_signals(),
+    }
+    payloads = {name: _json_dumps(snapshot[name]) for name in _SECTION_NAMES}
+    with _dashboard_cond:
+        version = _dashboard_version + 1
+        changed = False
+        for name, payload in payloads.items():
+            prev = _dashboard_sections.get(name)
+            if prev is None or prev[1] != payload:
+                _dashboard_sections[name] = (version, payload)
+                changed = True
+        if changed:
+            _dashboard_version = version
+            _dashboard_cond.notify_all()
+
+
+def _dashboard_refresher():
+    while True:
+        try:
+            _refresh_dashboard()
+        except Exception as exc:
+            logger.error(f'Dashboard refresh failed: {exc}')
+        finally:
+            # End the read transaction so the next refresh sees new writes;
+            # the pooled connection itself is reused.
+            SessionLocal.remove()
+        # Sleep until the writer commits something. The timeout only
+        # covers purely time-driven changes (e.g. the metrics window
+        # rolling over at midnight); an idle system does no per-second
+        # query work at all.
+        _dashboard_dirty.wait(timeout=15.0)
+        _dashboard_dirty.clear()
+
+
+#--- API endpoints
+@app.route('/api/health', methods=['GET'])
+def health():
+    """Health check used by the EA on init and by Render."""
+    try:
+        conn = get_db_connection()
+        try:
+            cur = conn.cursor()
+            cur.execute('SELECT 1')
+            cur.close()
+        finally:
+            conn.close()
+        db_status = 'connected'
+    except Exception as exc:  # pragma: no cover - depends on deployment
+        logger.error(f'Health check DB failure: {exc}')
+        db_status = 'error'
+
+    return jsonify({
+        'status': 'healthy',
+        'database': db_status,
+        'system': _system_status,
+        'timestamp': time.time(),
+    })
+
+
+@app.route('/api/ticks', methods=['POST'])
+def receive_ticks():
+    """Receive a batch of buffered ticks from the MT4 EA."""
+    now = time.time()
+    symbol = 'EURUSD'
+    if _tick_decoder is not None:
+        # msgspec parses and validates the payload in one C pass and the
+        # struct fields land as unboxed attributes, replacing the
+        # six-dict.get()-per-tick normalization chain.
+        try:
+            batch = _tick_decoder.decode(request.get_data(cache=False))
+        except msgspec.DecodeError:
+            batch = None
+        if batch is not None:
+            symbol = batch.symbol
+            rows = [(t.timestamp or now, symbol, t.bid, t.ask, t.spread,
+                     t.volume) for t in batch.ticks]
+        else:
+            rows = []
+    else:
+        data = request.get_json(silent=True) or {}
+        symbol = data.get('symbol', 'EURUSD')
+        rows = [(
+            t.get('timestamp', now),
+            symbol,
+            t.get('bid', 0),
+            t.get('ask', 0),
+            t.get('spread', 0),
+            t.get('volume', 0),
+        ) for t in data.get('ticks', [])]
+
+    # The EA flushes on a timer as well as on buffer-full, so empty
+    # batches are routine; answer them before touching queue or caches.
+    if not rows:
+        return jsonify({'status': 'success', 'ticks_received': 0})
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug('Received %d ticks for %s', len(rows), symbol)
+
+    _write_queue.put(('ticks', rows))
+
+    # Single appender (the EA), so no lock on either buffer; maxlen
+    # makes the deque eviction free and both buffers reuse the
+    # executemany row tuples - no per-tick dicts survive parsing.
+    cache['latest_ticks'].extend(rows)
+    tick_ring.extend(rows)
+
+    return jsonify({'status': 'success', 'ticks_received': len(rows)})
+
+
+@app.route('/api/trades', methods=['POST'])
+def log_trade():
+    """Log a trade from the EA. Open and close events share the endpoint."""
+    data = request.get_json(silent=True) or {}
+    ticket = data.get('ticket')
+    if ticket is None:
+        # Without a ticket the row could never be matched to its close
+        # report; reject before it becomes a NULL-heavy junk row.
+        return jsonify({'status': 'error', 'message': 'ticket required'}), 400
+
+    logger.info('Trade payload: %s', data)
+
+    values = {'ticket': ticket}
+    for field in ('symbol', 'lots', 'open_price', 'open_time', 'sl',
+                  'tp', 'close_price', 'close_time', 'profit', 'comment'):
+        if field in data:
+            values[field] = data[field]
+    if 'type' in data:
+        values['direction'] = data['type']
+
+    _write_queue.put(('trade', values))
+    return jsonify({'status': 'success', 'ticket': ticket})
+
+
+@app.route('/api/signals', methods=['POST'])
+def post_signal():
+    """Publish a new trading signal from the AI engine."""
+    data = request.get_json(silent=True) or {}
+    if not data.get('direction'):
+        return jsonify({'status': 'error',
+                        'message': 'direction required'}), 400
+
+    logger.info('Signal received: %s', data)
+
+    signal = {
+        'timestamp': data.get('timestamp', time.time()),
+        'symbol': data.get('symbol', 'EURUSD'),
+        'direction': data.get('direction'),
+        'entry_price': data.get('entry_price', 0),
+        'sl': data.get('sl', 0),
+        'tp': data.get('tp', 0),
+        'confidence': data.get('confidence', 0),
+    }
+
+    _write_queue.put(('signal', signal))
+
+    global _signal_version, _signal_response
+    _signal_version += 1
+    _signal_response = (_json_dumps(signal), f'"{_signal_version}"')
+
+    return jsonify({'status': 'success'})
+
+
+@app.route('/api/signals', methods=['GET'])
+def get_signals():
+    """Latest signal for the MT4 EA polling loop.
+
+    No per-request serialization: the body was rendered when the signal
+    was posted, and a matching If-None-Match poll costs only a 304.
+    """
+    body, etag = _signal_response
+    if request.headers.get('If-None-Match') == etag:
+        return Response(status=304, headers={'ETag': etag})
+    return Response(body, mimetype='application/json',
+                    headers={'ETag': etag})
+
+
+@app.route('/api/dashboard/data', methods=['GET'])
+def dashboard_data():
+    """One-shot snapshot of everything the dashboard shows."""
+    return jsonify({
+        'metrics': calculate_metrics(),
+        'positions': get_live_positions(),
+        'trades': get_recent_trades(),
+        'signals': get_recent_signals(),
+    })
+
+
+@app.route('/api/dashboard/stream', methods=['GET'])
+def dashboard_stream():
+    """Server-Sent Events stream consumed by the React dashboard."""
+    def generate():
+        last_version = 0
+        while True:
+            frames = []
+            # Never yield while holding the condition: a slow client
+            # socket must not stall the refresher or other clients.
+            with _dashboard_cond:
+                if _dashboard_version == last_version:
+                    _dashboard_cond.wait(timeout=15.0)
+                if _dashboard_version != last_version:
+                    for name in _SECTION_NAMES:
+                        version, payload = _dashboard_sections[name]
+                        if version > last_version:
+                            frames.append(b'event: ' + name.encode()
+                                          + b'\ndata: ' + payload + b'\n\n')
+                    last_version = _dashboard_version
+
+            if frames:
+                for frame in frames:
+                    yield frame
+            else:
+                # SSE comment: keeps proxies from dropping the idle stream
+                yield b':\n\n'
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no',
+        },
+    )
+
+
+init_database()
+
+# Started after the schema exists so the first refresh cannot race
+# table creation.
+threading.Thread(target=_db_writer, name='db-writer', daemon=True).start()
+threading.Thread(target=_dashboard_refresher, name='dashboard-refresher',
+                 daemon=True).start()
+
+if __name__ == '__main__':
+    app.run(host='0.0.0.0', port=int(os.environ.get('PORT', 10000)),
+            threaded=True)
@@ -0,0 +1,40 @@
+"""
+Gunicorn configuration for the Render deployment.
+
+Each dashboard viewer holds an SSE connection open indefinitely; under
+the default sync workers (or app.run(threaded=True)) that costs one OS
+thread per client. The gevent worker multiplexes all of those idle
+connections onto greenlets in a single event loop, so a few hundred
+viewers no longer mean a few hundred blocked threads.
+
+Render picks this file up automatically when the start command is
+`gunicorn app:app` run from the backend directory.
+"""
+
+import os
+
+bind = '0.0.0.0:' + os.environ.get('PORT', '10000')
+
+worker_class = 'gevent'
+worker_connections = 1000
+
+# The dashboard snapshot, tick cache and latest-signal state live in
+# process memory, so everything must stay in one worker.
+workers = 1
+
+# SSE connections are long-lived by design; do not kill quiet workers.
+timeout = 0
+
+_database_url = os.environ.get('DATABASE_URL', '')
+
+
+def post_fork(server, worker):
+    # psycopg2 is a blocking C driver: without the wait callback every
+    # Postgres round trip from the writer or refresher greenlet would
+    # stall the whole event loop, SSE clients and tick ingest included.
+    # psycogreen swaps the driver's socket waits for gevent-cooperative
+    # ones. SQLite needs none of this (and has no async wait protocol).
+    if _database_url.startswith(('postgres://', 'postgresql://')):
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
+        worker.log.info('psycogreen: psycopg2 patched for gevent')